@@ -2,441 +2,282 @@
 This module takes care of starting the API Server, Loading the DB and Adding the endpoints
 """
 import os
-from flask import Flask, abort, request, jsonify, url_for
+import threading
+import time
+import msgspec
+import orjson
+from flask import Flask, abort, request, url_for
 from flask_migrate import Migrate
 from flask_swagger import swagger
 from flask_cors import CORS
-from utils import APIException, generate_sitemap
+from flask_compress import Compress
+from typing import Any
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from cache import CACHE_TTL, cached, conditional_response, invalidate
+from utils import APIException, OrJSONProvider, generate_sitemap
 from admin import setup_admin
 from models import Character, Planet, db, User, Vehicle, Favorite
 # from models import Person
 
 app = Flask(__name__)
 app.url_map.strict_slashes = False
+app.json = OrJSONProvider(app)
 
 db_url = os.getenv("DATABASE_URL")
 if db_url is not None:
     app.config['SQLALCHEMY_DATABASE_URI'] = db_url.replace(
         "postgres://", "postgresql://")
+    # pool dimensionado para los workers de gunicorn (2x8 threads) y con
+    # pre_ping para descartar conexiones muertas sin tumbar el request
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_pre_ping': True,
+    }
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite:////tmp/test.db"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# comprime las respuestas JSON grandes (los listados) antes de enviarlas
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+
 MIGRATE = Migrate(app, db)
 db.init_app(app)
+# alias locales de los atributos calientes: un lookup de modulo (o celda
+# de closure) por request en vez de dos accesos de atributo
+session = db.session
+get_or_404 = db.get_or_404
 CORS(app)
+Compress(app)
 setup_admin(app)
 
-# Handle/serialize errors like a JSON object
-
-
-@app.errorhandler(APIException)
-def handle_invalid_usage(error):
-    return jsonify(error.to_dict()), error.status_code
-
-# generate sitemap with all your endpoints
-
+def ojsonify(data, status=200):
+    """Serializa con orjson (mucho más rápido que el json de Flask)."""
+    return app.response_class(orjson.dumps(data), status=status,
+                              mimetype='application/json')
 
-@app.route('/')
-def sitemap():
-    return generate_sitemap(app)
 
-# ==========================
-#     ENDPOINTS DE USER
-# ==========================
-@app.route('/users', methods=['GET'])
-def get_all_users():
-    users = User.query.all()
-    users_to_json = jsonify([user.serialize() for user in users])
-    return users_to_json, 200
-
-
-@app.route('/users/<int:user_id>', methods=['GET'])
-def get_user_by_id(user_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description="User not found")
-    user_to_json = jsonify(user.serialize())
-    return user_to_json, 200
-
-
-@app.route('/users/<string:email>', methods=['GET'])
-def get_user_by_email(email):
-    user = User.query.filter_by(email=email).first()
-    if user is None:
-        abort(404, description="User not found")
-    user_to_json = jsonify(user.serialize())
-    return user_to_json, 200
-
-
-@app.route('/users', methods=['POST'])
-def create_user():
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    required_fields = ['email', 'password']
-    for field in required_fields:
-        if field not in body or not body[field]:
-            abort(422, description=f"'{field}' is required")
-    existing_email = User.query.filter_by(email=body['email']).first()
-    if existing_email:
-        abort(409, description="Email already exists")
+def parse_body():
+    """Parsea el cuerpo con orjson sobre los bytes crudos, sin pasar por
+    request.get_json() ni retener el buffer en el request."""
     try:
-        new_user = User(email=body["email"],
-                        password=body["password"],
-                        first_name=body.get("first_name"),
-                        last_name=body.get("last_name"))
-        db.session.add(new_user)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(new_user.serialize()), 201
-
-
-@app.route('/users/<int:user_id>', methods=['PUT'])
-def update_user(user_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description=f"User with ID {user_id} not found")
-    body = request.get_json()
-    if not body:
+        body = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
         abort(400, description="Request body must be JSON")
-    if 'email' in body and body['email'] != user.email:
-        existing_email = User.query.filter_by(email=body['email']).first()
-        if existing_email:
-            abort(409, description="Email already exists")
-    try:
-        user.email = body['email']
-        user.password = body['password']
-        user.first_name = body.get("first_name")
-        user.last_name = body.get("last_name")
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(user.serialize()), 200
-
-
-@app.route('/users/<int:user_id>', methods=['DELETE'])
-def delete_user(user_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description=f"User with ID {user_id} not found")
-    try:
-        db.session.delete(user)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify({"message": f"User with ID {user_id} has been deleted"}), 200
-
-
-
-# ==========================
-#     ENDPOINTS DE CHARACTER
-# ==========================
-@app.route('/characters', methods=['GET'])
-def get_all_characters():
-    characters = Character.query.all()
-    characters_to_json = jsonify([character.serialize() for character in characters])
-    return characters_to_json, 200
-
-
-@app.route('/characters/<int:id>', methods=['GET'])
-def get_character_by_id(id):
-    character = Character.query.get(id)
-    if character is None:
-        abort(404, description="Character not found")
-    character_to_json = jsonify(character.serialize())
-    return character_to_json, 200
-
-
-@app.route('/characters/<string:name>', methods=['GET'])
-def get_character_by_name(name):
-    character = Character.query.filter_by(name=name).first()
-    if character is None:
-        abort(404, description="Character not found")
-    character_to_json = jsonify(character.serialize())
-    return character_to_json, 200
-
-
-@app.route('/characters', methods=['POST'])
-def create_character():
-    body = request.get_json()
     if not body:
         abort(400, description="Request body must be JSON")
-    required_fields = ['name']
-    for field in required_fields:
-        if field not in body or not body[field]:
-            abort(422, description=f"'{field}' is required")
-    existing_name = Character.query.filter_by(name=body['name']).first()
-    if existing_name:
-        abort(409, description="Name already exists")
-    try:
-        new_character = Character(name=body["name"],
-                        gender=body.get("gender"),
-                        height=body.get("height"),
-                        mass=body.get("mass"))
-        db.session.add(new_character)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(new_character.serialize()), 201
-
-
-@app.route('/characters/<int:character_id>', methods=['PUT'])
-def update_character(character_id):
-    character = Character.query.get(character_id)
-    if character is None:
-        abort(404, description=f"Character with ID {character_id} not found")
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    if 'name' in body and body['name'] != character.name:
-        existing_name = Character.query.filter_by(name=body['name']).first()
-        if existing_name:
-            abort(409, description="Name already exists")
-    try:
-        character.name = body['name']
-        character.gender = body.get('gender')
-        character.height = body.get("height")
-        character.mass = body.get("mass")
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(character.serialize()), 200
-
-
-@app.route('/characters/<int:character_id>', methods=['DELETE'])
-def delete_character(character_id):
-    character = Character.query.get(character_id)
-    if character is None:
-        abort(404, description=f"Character with ID {character_id} not found")
-    try:
-        db.session.delete(character)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify({"message": f"Character with ID {character_id} has been deleted"}), 200
-
+    return body
 
+# Handle/serialize errors like a JSON object
 
-# ==========================
-#     ENDPOINTS DE PLANET
-# ==========================
-@app.route('/planets', methods=['GET'])
-def get_all_planets():
-    planets = Planet.query.all()
-    planets_to_json = jsonify([planet.serialize() for planet in planets])
-    return planets_to_json, 200
-
-
-@app.route('/planets/<int:planet_id>', methods=['GET'])
-def get_planet_by_id(planet_id):
-    planet = Planet.query.get(planet_id)
-    if planet is None:
-        abort(404, description="Planet not found")
-    planet_to_json = jsonify(planet.serialize())
-    return planet_to_json, 200
-
-
-@app.route('/planets/<string:name>', methods=['GET'])
-def get_planet_by_name(name):
-    planet = Planet.query.filter_by(name=name).first()
-    if planet is None:
-        abort(404, description="Planet not found")
-    planet_to_json = jsonify(planet.serialize())
-    return planet_to_json, 200
-
-
-@app.route('/planets', methods=['POST'])
-def create_planet():
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    required_fields = ['name']
-    for field in required_fields:
-        if field not in body or not body[field]:
-            abort(422, description=f"'{field}' is required")
-    existing_name = Planet.query.filter_by(name=body['name']).first()
-    if existing_name:
-        abort(409, description="Name already exists")
-    try:
-        new_planet = Planet(name=body["name"],
-                        climate=body.get("climate"),
-                        population=body.get("population"),
-                        terrain=body.get("terrain"))
-        db.session.add(new_planet)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(new_planet.serialize()), 201
 
+@app.errorhandler(APIException)
+def handle_invalid_usage(error):
+    return ojsonify(error.to_dict(), error.status_code)
 
-@app.route('/planets/<int:planet_id>', methods=['PUT'])
-def update_planet(planet_id):
-    planet = Planet.query.get(planet_id)
-    if planet is None:
-        abort(404, description=f"Planet with ID {planet_id} not found")
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    if 'name' in body and body['name'] != planet.name:
-        existing_name = Planet.query.filter_by(name=body['name']).first()
-        if existing_name:
-            abort(409, description="Name already exists")
-    try:
-        planet.name = body['name']
-        planet.climate = body.get("climate")
-        planet.population = body.get("population")
-        planet.terrain = body.get("terrain")
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(planet.serialize()), 200
+# generate sitemap with all your endpoints
 
 
-@app.route('/planets/<int:planet_id>', methods=['DELETE'])
-def delete_planet(planet_id):
-    planet = Planet.query.get(planet_id)
-    if planet is None:
-        abort(404, description=f"Planet with ID {planet_id} not found")
-    try:
-        db.session.delete(planet)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify({"message": f"Planet with ID {planet_id} has been deleted"}), 200
+_sitemap_html = None
 
 
+@app.route('/')
+def sitemap():
+    # el url_map queda congelado tras registrar las rutas, asi que el HTML
+    # se genera una sola vez y se reutiliza (url_for necesita contexto de
+    # request, por eso no puede precalcularse en el import)
+    global _sitemap_html
+    if _sitemap_html is None:
+        _sitemap_html = generate_sitemap(app, APP_RULES)
+    return _sitemap_html
 
 # ==========================
-#     ENDPOINTS DE VEHICLE
+#     CRUD GENERICO
 # ==========================
-@app.route('/vehicles', methods=['GET'])
-def get_all_vehicles():
-    vehicles = Vehicle.query.all()
-    vehicles_to_json = jsonify([vehicle.serialize() for vehicle in vehicles])
-    return vehicles_to_json, 200
-
-
-@app.route('/vehicles/<int:vehicle_id>', methods=['GET'])
-def get_vehicle_by_id(vehicle_id):
-    vehicle = Vehicle.query.get(vehicle_id)
-    if vehicle is None:
-        abort(404, description="Vehicle not found")
-    vehicle_to_json = jsonify(vehicle.serialize())
-    return vehicle_to_json, 200
-
-
-@app.route('/vehicles/<string:name>', methods=['GET'])
-def get_vehicle_by_name(name):
-    vehicle = Vehicle.query.filter_by(name=name).first()
-    if vehicle is None:
-        abort(404, description="Vehicle not found")
-    vehicle_to_json = jsonify(vehicle.serialize())
-    return vehicle_to_json, 200
-
-
-@app.route('/vehicles', methods=['POST'])
-def create_vehicle():
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    required_fields = ['name']
-    for field in required_fields:
-        if field not in body or not body[field]:
-            abort(422, description=f"'{field}' is required")
-    existing_name = Vehicle.query.filter_by(name=body['name']).first()
-    if existing_name:
-        abort(409, description="Name already exists")
-    try:
-        new_vehicle = Vehicle(name=body["name"],
-                        cargo_capacity=body.get("cargo_capacity"),
-                        length=body.get("length"),
-                        model=body.get("model"))
-        db.session.add(new_vehicle)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error :)")
-    return jsonify(new_vehicle.serialize()), 201
-
-
-@app.route('/vehicles/<int:vehicle_id>', methods=['PUT'])
-def update_vehicle(vehicle_id):
-    vehicle = Vehicle.query.get(vehicle_id)
-    if vehicle is None:
-        abort(404, description=f"Vehicle with ID {vehicle_id} not found")
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
-    if 'name' in body and body['name'] != vehicle.name:
-        existing_name = Vehicle.query.filter_by(name=body['name']).first()
-        if existing_name:
-            abort(409, description="Name already exists")
-    try:
-        vehicle.name = body['name']
-        vehicle.cargo_capacity = body.get("cargo_capacity")
-        vehicle.length = body.get("length")
-        vehicle.model = body.get("model")
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify(vehicle.serialize()), 200
-
-
-@app.route('/vehicles/<int:vehicle_id>', methods=['DELETE'])
-def delete_vehicle(vehicle_id):
-    vehicle = Vehicle.query.get(vehicle_id)
-    if vehicle is None:
-        abort(404, description=f"Vehicle with ID {vehicle_id} not found")
-    try:
-        db.session.delete(vehicle)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        abort(500, description="Internal Server Error")
-    return jsonify({"message": f"Vehicle with ID {vehicle_id} has been deleted"}), 200
-
+# tier 1 de cache para los listados: blobs JSON ya serializados en memoria
+# del proceso, invalidados por las mutaciones de cada recurso. El TTL
+# (el mismo que el tier Redis) acota lo que un worker puede servir
+# desactualizado cuando la escritura la atendio otro worker.
+_list_cache = {}
+_list_cache_lock = threading.Lock()
+
+
+def register_crud(app, model, path, unique_field, fields,
+                  required_fields=None, public_fields=None):
+    """
+    Registra los 5 endpoints CRUD (GET all, GET by id, POST, PUT, DELETE)
+    de un modelo. Los handlers son closures, asi que model/fields quedan
+    ligados en celdas de closure (menos lookups globales por request) y el
+    URL map no crece con codigo copiado y pegado por modelo.
+    """
+    name = model.__name__
+    resource = path.strip('/')
+    if required_fields is None:
+        required_fields = [unique_field]
+    optional_fields = [f for f in fields if f not in required_fields]
+    unique_col = getattr(model, unique_field)
+    # columnas que expone la API (lo mismo que serialize() pero sin
+    # hidratar instancias ORM en los listados)
+    if public_fields is None:
+        public_fields = fields
+    list_columns = [model.id] + [getattr(model, f) for f in public_fields]
+    list_key = f"{resource}:all"
+    # schema compilado una sola vez: msgspec parsea los bytes crudos y
+    # valida requeridos/tipos en C, sin bucle Python por request
+    body_struct = msgspec.defstruct(
+        f"{name}Body",
+        [(f, str) for f in required_fields]
+        + [(f, Any, None) for f in optional_fields])
+    decode_body = msgspec.json.Decoder(body_struct).decode
+
+    def parse_crud_body():
+        try:
+            parsed = decode_body(request.get_data())
+        except msgspec.ValidationError as err:
+            abort(422, description=str(err))
+        except msgspec.DecodeError:
+            abort(400, description="Request body must be JSON")
+        for f in required_fields:
+            if not getattr(parsed, f):
+                abort(422, description=f"'{f}' is required")
+        return parsed
+
+    @cached(lambda: list_key)
+    def get_all():
+        entry = _list_cache.get(resource)
+        if entry is not None and time.monotonic() - entry[1] < CACHE_TTL:
+            payload = entry[0]
+        else:
+            rows = session.execute(select(*list_columns)).mappings().all()
+            payload = orjson.dumps([dict(row) for row in rows])
+            with _list_cache_lock:
+                _list_cache[resource] = (payload, time.monotonic())
+        return app.response_class(payload, mimetype='application/json')
+
+    # la clave de cache por nombre se normaliza con lower() para que
+    # "Luke" y "luke" compartan entrada y la invalidacion las cubra
+    @cached(lambda key: f"{resource}:{key if key.isdecimal() else key.lower()}")
+    def get_one(key):
+        # una sola ruta GET /{path}/<key>: id numerico va directo al
+        # identity map, cualquier otra cosa busca por la columna unica
+        # isdecimal, no isdigit: "²" es digit pero int("²") lanza ValueError
+        if key.isdecimal():
+            item = session.get(model, int(key))
+        else:
+            item = session.scalar(
+                select(model)
+                .where(func.lower(unique_col) == key.lower())
+                .limit(1))
+        if item is None:
+            abort(404, description=f"{name} not found")
+        return conditional_response(orjson.dumps(item.serialize()))
+
+    def create():
+        body = parse_crud_body()
+        try:
+            row = session.execute(
+                insert(model).values(**msgspec.structs.asdict(body))
+                .returning(*list_columns)
+            ).mappings().one()
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            abort(409, description=f"{unique_field.capitalize()} already exists")
+        except Exception:
+            session.rollback()
+            abort(500, description="Internal Server Error")
+        _list_cache.pop(resource, None)
+        invalidate(list_key)
+        return ojsonify(dict(row), 201)
+
+    def update(item_id):
+        item = get_or_404(model, item_id,
+                             description=f"{name} with ID {item_id} not found")
+        body = parse_crud_body()
+        old_unique = getattr(item, unique_field)
+        try:
+            for f, value in msgspec.structs.asdict(body).items():
+                setattr(item, f, value)
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            abort(409, description=f"{unique_field.capitalize()} already exists")
+        except Exception:
+            session.rollback()
+            abort(500, description="Internal Server Error")
+        _list_cache.pop(resource, None)
+        invalidate(list_key, f"{resource}:{item_id}",
+                   f"{resource}:{old_unique.lower()}")
+        return ojsonify(item.serialize())
+
+    def delete(item_id):
+        item = get_or_404(model, item_id,
+                             description=f"{name} with ID {item_id} not found")
+        old_unique = getattr(item, unique_field)
+        try:
+            session.delete(item)
+            session.commit()
+        except Exception:
+            session.rollback()
+            abort(500, description="Internal Server Error")
+        _list_cache.pop(resource, None)
+        invalidate(list_key, f"{resource}:{item_id}",
+                   f"{resource}:{old_unique.lower()}")
+        return ojsonify({"message": f"{name} with ID {item_id} has been deleted"})
+
+    app.add_url_rule(path, f"get_all_{resource}", get_all, methods=['GET'])
+    app.add_url_rule(f"{path}/<key>", f"get_{resource}", get_one,
+                     methods=['GET'])
+    app.add_url_rule(path, f"create_{resource}", create, methods=['POST'])
+    app.add_url_rule(f"{path}/<int:item_id>", f"update_{resource}",
+                     update, methods=['PUT'])
+    app.add_url_rule(f"{path}/<int:item_id>", f"delete_{resource}",
+                     delete, methods=['DELETE'])
+
+
+register_crud(app, User, '/users', 'email',
+              ['email', 'password', 'first_name', 'last_name'],
+              required_fields=['email', 'password'],
+              public_fields=['email', 'first_name', 'last_name'])
+register_crud(app, Character, '/characters', 'name',
+              ['name', 'gender', 'height', 'mass'])
+register_crud(app, Planet, '/planets', 'name',
+              ['name', 'climate', 'population', 'terrain'])
+register_crud(app, Vehicle, '/vehicles', 'name',
+              ['name', 'cargo_capacity', 'length', 'model'])
 
 
 # ==========================
 #     ENDPOINTS DE FAVORITE
 # ==========================
+FAVORITE_COLUMNS = (Favorite.id, Favorite.user_id, Favorite.planet_id,
+                    Favorite.character_id, Favorite.vehicle_id,
+                    Favorite.created_at)
+
+
 @app.route('/favorites', methods=['GET'])
 def get_all_favorites():
-    favorites = Favorite.query.all()
-    favorites_to_json = jsonify([favorite.serialize() for favorite in favorites])
-    return favorites_to_json, 200
+    rows = session.execute(select(*FAVORITE_COLUMNS)).mappings().all()
+    return ojsonify([dict(row) for row in rows])
 
 
 @app.route('/users/<int:user_id>/favorites', methods=['GET'])
 def get_user_favorites(user_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description="User not found")
-    favorites = Favorite.query.filter_by(user_id=user_id).all()
-    favorites_to_json = jsonify([favorite.serialize() for favorite in favorites])
-    return favorites_to_json, 200
+    user = get_or_404(User, user_id, description="User not found")
+    rows = session.execute(
+        select(*FAVORITE_COLUMNS).where(Favorite.user_id == user_id)
+    ).mappings().all()
+    return ojsonify([dict(row) for row in rows])
 
 
 @app.route('/users/<int:user_id>/favorites', methods=['POST'])
 def add_favorite(user_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description="User not found")
-    body = request.get_json()
-    if not body:
-        abort(400, description="Request body must be JSON")
+    user = get_or_404(User, user_id, description="User not found")
+    body = parse_body()
     planet_id = body.get("planet_id")
     character_id = body.get("character_id")
     vehicle_id = body.get("vehicle_id")
@@ -449,40 +290,44 @@ def add_favorite(user_id):
         filters["character_id"] = character_id
     else:
         filters["vehicle_id"] = vehicle_id
-    existing_favorite = Favorite.query.filter_by(**filters).first()
-    if existing_favorite:
+    conditions = [getattr(Favorite, attr) == value
+                  for attr, value in filters.items()]
+    if session.scalar(select(exists().where(*conditions))):
         abort(409, description="This item is already in user favorites")
     try:
-        new_favorite = Favorite(
-            user_id=user_id,
-            planet_id=planet_id,
-            character_id=character_id,
-            vehicle_id=vehicle_id
-        )
-        db.session.add(new_favorite)
-        db.session.commit()
+        row = session.execute(
+            insert(Favorite).values(user_id=user_id,
+                                    planet_id=planet_id,
+                                    character_id=character_id,
+                                    vehicle_id=vehicle_id)
+            .returning(*FAVORITE_COLUMNS)
+        ).mappings().one()
+        session.commit()
     except Exception:
-        db.session.rollback()
+        session.rollback()
         abort(500, description="Internal Server Error")
-    return jsonify(new_favorite.serialize()), 201
+    return ojsonify(dict(row), 201)
 
 
 @app.route('/users/<int:user_id>/favorites/<int:favorite_id>', methods=['DELETE'])
 def delete_favorite(user_id, favorite_id):
-    user = User.query.get(user_id)
-    if user is None:
-        abort(404, description="User not found")
-    favorite = Favorite.query.get(favorite_id)
+    user = get_or_404(User, user_id, description="User not found")
+    favorite = session.get(Favorite, favorite_id)
     if favorite is None or favorite.user_id != user_id:
         abort(404, description="Favorite not found for this user")
     try:
-        db.session.delete(favorite)
-        db.session.commit()
+        session.delete(favorite)
+        session.commit()
     except Exception:
-        db.session.rollback()
+        session.rollback()
         abort(500, description="Internal Server Error")
-    return jsonify({"message": f"Favorite with ID {favorite_id} has been deleted"}), 200
+    return ojsonify({"message": f"Favorite with ID {favorite_id} has been deleted"})
+
+
 
+# con todas las rutas ya registradas, el url_map no cambia mas: se
+# materializa una sola vez en vez de iterarlo en cada generacion
+APP_RULES = tuple(app.url_map.iter_rules())
 
 
 # this only runs if `$ python src/app.py` is executed
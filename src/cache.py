@@ -0,0 +1,75 @@
+"""
+Helpers de caching: cache de respuestas JSON en Redis y respuestas
+condicionales HTTP (ETag / If-None-Match).
+
+El cache Redis se activa solo si REDIS_URL esta definida; sin Redis los
+helpers son no-ops y la API se comporta igual que antes. Se guardan los
+bytes ya serializados, asi que un hit se salta la query Y la
+serializacion.
+"""
+import hashlib
+import os
+from functools import wraps
+
+import redis
+from flask import current_app, request
+
+_redis_url = os.getenv("REDIS_URL")
+redis_client = redis.from_url(_redis_url) if _redis_url else None
+
+CACHE_TTL = 60  # segundos
+
+
+def cached(make_key, ttl=CACHE_TTL):
+    """
+    Decorador para handlers GET idempotentes: si hay hit devuelve los
+    bytes cacheados directamente; si no, ejecuta el handler y guarda la
+    respuesta con SETEX. make_key recibe los kwargs de la ruta.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(**kwargs):
+            if redis_client is None:
+                return handler(**kwargs)
+            key = make_key(**kwargs)
+            try:
+                hit = redis_client.get(key)
+            except redis.RedisError:
+                hit = None
+            if hit is not None:
+                return conditional_response(hit)
+            response = handler(**kwargs)
+            if response.status_code == 200:
+                try:
+                    redis_client.setex(key, ttl, response.get_data())
+                except redis.RedisError:
+                    pass
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate(*keys):
+    """Borra las keys indicadas; silencioso si Redis no esta disponible."""
+    if redis_client is None or not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError:
+        pass
+
+
+def conditional_response(payload):
+    """
+    Respuesta JSON con ETag. Si el cliente ya tiene estos bytes
+    (If-None-Match coincide) devuelve un 304 sin cuerpo.
+    """
+    etag = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    response = current_app.response_class(
+        payload, mimetype='application/json')
+    response.set_etag(etag)
+    return response
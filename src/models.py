@@ -1,9 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, timezone
 
-db = SQLAlchemy()
+# Sin expire_on_commit, leer un objeto tras el commit (p.ej. serialize()
+# en los PUT) no dispara un SELECT de refresco.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 class User(db.Model):
     """
@@ -47,7 +49,7 @@ class Character(db.Model):
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     gender: Mapped[str] = mapped_column(String(20), nullable=True)
     height: Mapped[str] = mapped_column(String(20), nullable=True)
     mass: Mapped[int] = mapped_column(Integer(), nullable=True)
@@ -80,7 +82,7 @@ class Planet(db.Model):
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     climate: Mapped[str] = mapped_column(String(100), nullable=True)
     terrain: Mapped[str] = mapped_column(String(100), nullable=True)
     population: Mapped[int] = mapped_column(BigInteger(), nullable=True)
@@ -113,7 +115,7 @@ class Vehicle(db.Model):
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     cargo_capacity: Mapped[str] = mapped_column(String(50), nullable=True)
     length: Mapped[str] = mapped_column(String(50), nullable=True)
     model: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -137,6 +139,15 @@ class Vehicle(db.Model):
             "model": self.model
         }
 
+# Indices funcionales para las busquedas por nombre case-insensitive
+# (lower(name) = lower(:param) resuelve con un probe de indice). El de
+# email es unique para que no puedan convivir dos emails que solo
+# difieren en mayusculas.
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+Index("ix_characters_name_lower", func.lower(Character.name))
+Index("ix_planets_name_lower", func.lower(Planet.name))
+Index("ix_vehicles_name_lower", func.lower(Vehicle.name))
+
 class Favorite(db.Model):
     """
     Conecta un usuario con:
@@ -1,4 +1,19 @@
+import orjson
 from flask import jsonify, url_for
+from flask.json.provider import JSONProvider
+
+class OrJSONProvider(JSONProvider):
+    """
+    Proveedor JSON de Flask basado en orjson, para que cualquier jsonify
+    restante (extensiones incluidas) serialice con orjson en vez del
+    json de la stdlib.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 class APIException(Exception):
     status_code = 400
@@ -20,9 +35,11 @@ def has_no_empty_params(rule):
     arguments = rule.arguments if rule.arguments is not None else ()
     return len(defaults) >= len(arguments)
 
-def generate_sitemap(app):
+def generate_sitemap(app, rules=None):
+    if rules is None:
+        rules = app.url_map.iter_rules()
     links = ['/admin/']
-    for rule in app.url_map.iter_rules():
+    for rule in rules:
         # Filter out rules we can't navigate to in a browser
         # and rules that require parameters
         if "GET" in rule.methods and has_no_empty_params(rule):